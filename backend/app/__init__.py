@@ -1 +1 @@
-__all__ = ["main", "config", "db", "models", "schemas", "otp", "messaging", "games_clients", "schedular", "utils"]
\ No newline at end of file
+__all__ = ["main", "config", "db", "models", "schemas", "otp", "messaging", "games_clients", "schedular", "utils", "migrate_phones", "source_health", "loadtest"]
\ No newline at end of file
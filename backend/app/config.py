@@ -32,6 +32,12 @@ class Settings(BaseSettings):
     GAMERPOWER_API: Optional[str] = Field(..., env="GAMERPOWER_API")
     EPIC_API: Optional[str] = Field(..., env="EPIC_API")
     POLL_INTERVAL_MINUTES: Optional[int] = Field(..., env="POLL_INTERVAL_MINUTES")
+    MIN_POLL_INTERVAL_MINUTES: Optional[int] = Field(None, env="MIN_POLL_INTERVAL_MINUTES")
+    MAX_POLL_INTERVAL_MINUTES: Optional[int] = Field(None, env="MAX_POLL_INTERVAL_MINUTES")
+
+    # Phone numbers
+    DEFAULT_COUNTRY_CODE: Optional[str] = Field(None, env="DEFAULT_COUNTRY_CODE")
+    DEFAULT_NATIONAL_NUMBER_LENGTH: Optional[int] = Field(None, env="DEFAULT_NATIONAL_NUMBER_LENGTH")
 
     class Config:
         env_file = str(_ENV_PATH)
@@ -7,11 +7,19 @@ import logging
 logger = logging.getLogger("games_client")
 
 
+class SourceFetchError(Exception):
+    """
+    Raised when a giveaway source could not be fetched or parsed,
+    so callers can tell a failing source from one with no giveaways.
+    """
+
+
 async def fetch_gamerpower(platform: Optional[str] = None) -> List[Dict]:
     """
     Fetch giveaways from GamerPower.
     Eg. https://www.gamerpower.com/api/giveaways?platform=steam
     Returns a list of giveaways as dicts.
+    Raises SourceFetchError on network / HTTP / parse errors.
     """
     params = {}
     if platform:
@@ -25,18 +33,18 @@ async def fetch_gamerpower(platform: Optional[str] = None) -> List[Dict]:
             r.raise_for_status()
             data = r.json()
             logger.info("ℹ️  Data fetched from GamePowet API")
-            # data is a list of giveaways
-            return data
+            # data is a list of giveaways; an object (status message) means none right now
+            return data if isinstance(data, list) else []
         
         except Exception as e:
-            logger.exception("❌ Failed to fetch GamerPower API")
-            return []
+            raise SourceFetchError(f"GamerPower: {e!r}") from e
         
         
 async def fetch_epic_freegames() -> List[Dict]:
     """
     Fetch Epic free games from Epic's public promotions endpoint.
     The official endpoint returns a complex structure; we parse and return a list of entries with id/title/url/end_point
+    Raises SourceFetchError on network / HTTP / parse errors.
     """
     url = settings.EPIC_API
     params = {"locale":"en-IN", "country":"IN", "allowCountries":"IN"}
@@ -77,8 +85,7 @@ async def fetch_epic_freegames() -> List[Dict]:
             return out
         
         except Exception as e:
-            logger.exception("❌ Failed to fetch Epic API")
-            return []
+            raise SourceFetchError(f"Epic: {e!r}") from e
             
 
 def normalize_gamerpower_item(item: Dict) -> Dict:
@@ -0,0 +1,411 @@
+"""
+Load-test mode for the public API endpoints.
+
+Drives the FastAPI app from inside this process, either through httpx's ASGI
+transport or through a uvicorn server started on localhost in the same event
+loop, so the app, the load generator and an optional synthetic poll all share
+one loop like they do in production. Messaging and the giveaway sources are
+stubbed. The database layer is real, but never the app's DATABASE_URL: by default
+a throwaway SQLite file is used, or pass --database-url for a scratch database
+(its tables are dropped and recreated before the run and dropped afterwards).
+--verified-users subscribers are seeded first so the synthetic poll does a
+production-sized users x games loop:
+
+    python -m app.loadtest --requests 5000 --concurrency 50 \\
+        --mix subscribe=1,verify=1,status=8 --verified-users 5000 \\
+        --poll-every 2 --p99-ms 250
+
+Prints a JSON report (throughput, p50/p95/p99 latency per endpoint, event-loop
+lag) and exits with status 1 if an SLO given on the command line is missed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger("loadtest")
+
+DEFAULT_MIX = "subscribe=1,verify=1,status=8"
+ENDPOINTS = ("subscribe", "verify", "status")
+PHONE_BASE = 919000000000
+LAG_SAMPLE_INTERVAL = 0.01  # seconds
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse 'subscribe=1,verify=1,status=8' into endpoint weights.
+    """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name!r} (expected one of {ENDPOINTS})")
+        mix[name] = float(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight in mix: {part!r}")
+    if not any(w > 0 for w in mix.values()):
+        raise ValueError("Request mix needs at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def _summary_ms(values: List[float]) -> Dict:
+    values = sorted(values)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "count": len(values),
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+        "max_ms": ms(values[-1] if values else None),
+    }
+
+
+class _Stubs:
+    """
+    Replaces outbound side effects with in-memory fakes and remembers OTPs so
+    /verify can be driven with valid codes.
+    """
+
+    def __init__(self, games: int):
+        self.otps: Dict[str, str] = {}
+        self.whatsapp_sent = 0
+        self.games = [
+            {"id": f"loadtest-{i}", "title": f"Load Test Game {i}", "url": None, "platform": "loadtest", "ends_at": None}
+            for i in range(games)
+        ]
+
+    async def send_sms_otp(self, phone: str, code: str) -> bool:
+        self.otps[phone] = code
+        return True
+
+    async def send_whatsapp_message(self, phone: str, message_text: str) -> bool:
+        self.whatsapp_sent += 1
+        return True
+
+    async def fetch_games(self) -> List[Dict]:
+        return list(self.games)
+
+    def install(self, main_module, scheduler_module):
+        main_module.send_sms_otp = self.send_sms_otp
+        scheduler_module.send_whatsapp_message = self.send_whatsapp_message
+        for name in scheduler_module.SOURCES:
+            scheduler_module.SOURCES[name] = self.fetch_games
+
+
+def _load_app(database_url: str):
+    """
+    Import the app bound to database_url. The engine is created when app.db is
+    first imported, so this has to run before anything else imports the app.
+    """
+    if "app.db" in sys.modules:
+        raise RuntimeError("app.db was imported before the load test picked its database")
+    settings.DATABASE_URL = database_url
+
+    import app.db as db_module
+    import app.main as main_module
+    import app.scheduler as scheduler_module
+    return db_module, main_module, scheduler_module
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace, mix: Dict[str, float], database_url: str):
+        self.args = args
+        self.mix = mix
+        self.db, self.main, self.scheduler = _load_app(database_url)
+        self.rng = random.Random(args.seed)
+        self.stubs = _Stubs(args.poll_games)
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.status_codes: Dict[str, Dict[str, int]] = {name: {} for name in ENDPOINTS}
+        self.failures = 0
+        self.loop_lag: List[float] = []
+        self.poll_durations: List[float] = []
+        self._remaining = 0
+        self._recording = False
+        self._stop = asyncio.Event()
+
+    def _next_request(self) -> Tuple[str, str, str, Optional[Dict]]:
+        endpoint = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        phone = f"+{PHONE_BASE + self.rng.randrange(self.args.phones)}"
+        if endpoint == "subscribe":
+            return endpoint, "POST", "/subscribe", {"phone": phone}
+        if endpoint == "verify":
+            # verify phones with a pending OTP so the success path (delete OTP,
+            # update user) is measured; wrong codes only at --verify-bad-code-rate
+            if self.stubs.otps and self.rng.random() >= self.args.verify_bad_code_rate:
+                phone = self.rng.choice(list(self.stubs.otps))
+                return endpoint, "POST", "/verify", {"phone": phone, "code": self.stubs.otps.pop(phone)}
+            return endpoint, "POST", "/verify", {"phone": phone, "code": "000000"}
+        return endpoint, "GET", f"/status/{phone}", None
+
+    async def _worker(self, client: httpx.AsyncClient):
+        while self._remaining > 0:
+            self._remaining -= 1
+            endpoint, method, path, body = self._next_request()
+            started = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body)
+                code = str(r.status_code)
+            except Exception as e:
+                logger.warning(f"❌ {method} {path} failed: {e!r}")
+                code = "error"
+            elapsed = time.perf_counter() - started
+
+            if not self._recording:
+                continue
+            self.latencies[endpoint].append(elapsed)
+            codes = self.status_codes[endpoint]
+            codes[code] = codes.get(code, 0) + 1
+            if code == "error" or code.startswith("5"):
+                self.failures += 1
+
+    async def _run_phase(self, client: httpx.AsyncClient, requests: int, record: bool) -> float:
+        self._remaining = requests
+        self._recording = record
+        started = time.perf_counter()
+        await asyncio.gather(*(self._worker(client) for _ in range(self.args.concurrency)))
+        return time.perf_counter() - started
+
+    async def _monitor_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            expected = loop.time() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            if self._recording:
+                self.loop_lag.append(max(0.0, loop.time() - expected))
+
+    async def _synthetic_poll(self):
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.args.poll_every)
+                return
+            except asyncio.TimeoutError:
+                pass
+            started = time.perf_counter()
+            try:
+                await self.scheduler.poll_and_alert()
+            except Exception:
+                logger.exception("❌ Synthetic poll failed")
+            if self._recording:
+                self.poll_durations.append(time.perf_counter() - started)
+
+    async def _client(self):
+        if self.args.transport == "asgi":
+            transport = httpx.ASGITransport(app=self.main.app)
+            return httpx.AsyncClient(transport=transport, base_url="http://loadtest"), None
+
+        import uvicorn
+        config = uvicorn.Config(self.main.app, host="127.0.0.1", port=self.args.port, lifespan="off", log_level="warning")
+        server = uvicorn.Server(config)
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            if server_task.done():
+                server_task.result()
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=self.args.concurrency)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{self.args.port}", limits=limits)
+        return client, (server, server_task)
+
+    async def _reset_schema(self, create: bool):
+        from sqlmodel import SQLModel
+        async with self.db.engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            if create:
+                await conn.run_sync(SQLModel.metadata.create_all)
+
+    async def _seed_verified_users(self):
+        """
+        Verified subscribers outside the request phone pool, so the synthetic poll
+        walks a production-sized users x games loop. Each is marked as already
+        alerted about the first --alerted-games stub games.
+        """
+        from app.models import User, AlertedGame
+
+        games = self.stubs.games[:self.args.alerted_games]
+        async with self.db.get_session() as session:
+            users = [
+                User(phone=f"+{PHONE_BASE + self.args.phones + i}", verified=True)
+                for i in range(self.args.verified_users)
+            ]
+            session.add_all(users)
+            await session.flush()
+            session.add_all(
+                AlertedGame(user_id=u.id, game_id=g["id"], game_title=g["title"])
+                for u in users
+                for g in games
+            )
+            await session.commit()
+
+    async def run(self) -> Dict:
+        self.stubs.install(self.main, self.scheduler)
+        # startup hook is skipped on purpose: no real scheduler during a load test,
+        # and every run starts from empty tables so results are reproducible
+        await self._reset_schema(create=True)
+        try:
+            await self._seed_verified_users()
+            return await self._run()
+        finally:
+            await self._reset_schema(create=False)
+            await self.db.engine.dispose()
+
+    async def _run(self) -> Dict:
+        client, server = await self._client()
+        background = [asyncio.create_task(self._monitor_loop_lag())]
+        if self.args.poll_every:
+            background.append(asyncio.create_task(self._synthetic_poll()))
+
+        try:
+            async with client:
+                if self.args.warmup:
+                    await self._run_phase(client, self.args.warmup, record=False)
+                elapsed = await self._run_phase(client, self.args.requests, record=True)
+        finally:
+            self._stop.set()
+            await asyncio.gather(*background, return_exceptions=True)
+            if server:
+                server[0].should_exit = True
+                await server[1]
+
+        return self._report(elapsed)
+
+    def _report(self, elapsed: float) -> Dict:
+        all_latencies = [v for values in self.latencies.values() for v in values]
+        completed = len(all_latencies)
+        endpoints = {}
+        for name in ENDPOINTS:
+            if not self.latencies[name]:
+                continue
+            endpoints[name] = _summary_ms(self.latencies[name])
+            endpoints[name]["status_codes"] = dict(sorted(self.status_codes[name].items()))
+
+        return {
+            "config": {
+                "transport": self.args.transport,
+                "requests": self.args.requests,
+                "warmup": self.args.warmup,
+                "concurrency": self.args.concurrency,
+                "mix": self.mix,
+                "phones": self.args.phones,
+                "verify_bad_code_rate": self.args.verify_bad_code_rate,
+                "verified_users": self.args.verified_users,
+                "alerted_games": self.args.alerted_games,
+                "seed": self.args.seed,
+                "poll_every_s": self.args.poll_every,
+                "poll_games": self.args.poll_games,
+            },
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(completed / elapsed, 1) if elapsed else None,
+            "failures": self.failures,
+            "error_rate": round(self.failures / completed, 4) if completed else None,
+            "overall": _summary_ms(all_latencies),
+            "endpoints": endpoints,
+            "event_loop_lag": _summary_ms(self.loop_lag),
+            "synthetic_polls": _summary_ms(self.poll_durations),
+        }
+
+
+def check_slo(report: Dict, args: argparse.Namespace) -> List[str]:
+    """
+    Returns a list of violated SLOs (empty if all passed or none were given).
+    """
+    violations = []
+    p99 = report["overall"]["p99_ms"]
+    if args.p99_ms is not None and p99 is not None and p99 > args.p99_ms:
+        violations.append(f"p99 {p99}ms > {args.p99_ms}ms")
+    rps = report["throughput_rps"]
+    if args.min_rps is not None and (rps or 0) < args.min_rps:
+        violations.append(f"throughput {rps} rps < {args.min_rps} rps")
+    lag = report["event_loop_lag"]["p99_ms"]
+    if args.max_loop_lag_ms is not None and lag is not None and lag > args.max_loop_lag_ms:
+        violations.append(f"event loop lag p99 {lag}ms > {args.max_loop_lag_ms}ms")
+    if args.max_error_rate is not None and (report["error_rate"] or 0) > args.max_error_rate:
+        violations.append(f"error rate {report['error_rate']} > {args.max_error_rate}")
+    return violations
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load-test /subscribe, /verify and /status in-process and report latency SLOs.")
+    parser.add_argument("--database-url", default=None, help="scratch database (tables are dropped!); default: temporary SQLite file")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi", help="drive the app via ASGI transport or a local uvicorn server")
+    parser.add_argument("--port", type=int, default=8765, help="port for --transport uvicorn")
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests sent first")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, eg. subscribe=1,verify=1,status=8")
+    parser.add_argument("--phones", type=int, default=500, help="size of the synthetic phone number pool")
+    parser.add_argument("--verify-bad-code-rate", type=float, default=0.05, help="share of /verify requests sent with a wrong code")
+    parser.add_argument("--verified-users", type=int, default=1000, help="verified subscribers seeded before the run")
+    parser.add_argument("--alerted-games", type=int, default=None, help="stub games each seeded user was already alerted about (default: all)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for the request sequence")
+    parser.add_argument("--poll-every", type=float, default=0, help="run a synthetic poll_and_alert every N seconds (0 = off)")
+    parser.add_argument("--poll-games", type=int, default=20, help="games returned by each stubbed source")
+    parser.add_argument("--p99-ms", type=float, default=None, help="fail if overall p99 latency exceeds this")
+    parser.add_argument("--min-rps", type=float, default=None, help="fail if throughput is below this")
+    parser.add_argument("--max-loop-lag-ms", type=float, default=None, help="fail if event loop lag p99 exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="fail if the 5xx/transport error rate exceeds this")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.database_url and args.database_url == settings.DATABASE_URL:
+        parser.error("--database-url must not be the app's DATABASE_URL; its tables would be dropped")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(f"--mix: {e}")
+    if not 0 <= args.verify_bad_code_rate <= 1:
+        parser.error("--verify-bad-code-rate must be between 0 and 1")
+    if args.alerted_games is None:
+        # fully alerted users: each poll runs the whole query loop without sending
+        args.alerted_games = args.poll_games
+
+    tmpdir = None
+    database_url = args.database_url
+    if not database_url:
+        tmpdir = tempfile.mkdtemp(prefix="fgw-loadtest-")
+        database_url = f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'loadtest.db')}"
+
+    try:
+        load_test = LoadTest(args, mix, database_url)
+        # request logging from the app would dominate the measurement
+        logging.getLogger().setLevel(logging.WARNING)
+        report = asyncio.run(load_test.run())
+    finally:
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    violations = check_slo(report, args)
+    report["slo_violations"] = violations
+
+    print(json.dumps(report, indent=2, sort_keys=True))
+    if violations:
+        for v in violations:
+            logger.error(f"❌ SLO violated: {v}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,7 @@ from app.otp import create_and_store_otp, verify_otp, cleanup_expired_otps
 from app.messaging import send_sms_otp
 from app.db import init_db, get_session
 from app.models import User
-from app.scheduler import start_scheduler, shutdown_scheduler
+from app.scheduler import start_scheduler, shutdown_scheduler, get_source_health
 from sqlmodel import select
 import logging
 
@@ -17,12 +17,24 @@ logger = logging.getLogger("freegamewatcher")
 
 app = FastAPI(title="FreeGameWatcher - Backend (MVP)")
 
+def _normalize_or_400(phone: str) -> str:
+    try:
+        return normalize_phone(phone)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid phone number. Use international format, eg. +919876543210.")
+
+
 @app.get("/health")
 async def health_check():
     from datetime import datetime, timezone
     logger.info("ℹ️  Health endpoint: OK✅")
     return {"ok": True, "now": datetime.now(timezone.utc).isoformat()}
 
+@app.get("/health/sources")
+async def sources_health():
+    return {"sources": get_source_health()}
+
+
 @app.on_event("startup")
 async def on_startup():
     logger.info("ℹ️  Initializing DB and scheduler...")
@@ -45,7 +57,7 @@ async def on_shutdown():
 async def subscribe(payload: SubscribeIn, background_tasks: BackgroundTasks):
     logger.info("ℹ️  Subscribing...")
     
-    phone = normalize_phone(payload.phone)
+    phone = _normalize_or_400(payload.phone)
     # create or find user (unverified)
     async with get_session() as session:  # AsyncSession
         q = select(User).where(User.phone == phone)
@@ -69,7 +81,7 @@ async def subscribe(payload: SubscribeIn, background_tasks: BackgroundTasks):
 
 @app.post("/verify")
 async def verify(payload: VerifyIn):
-    phone = normalize_phone(payload.phone)
+    phone = _normalize_or_400(payload.phone)
     
     ok = await verify_otp(phone, payload.code)
     if not ok:
@@ -94,7 +106,7 @@ async def verify(payload: VerifyIn):
 async def unsubscribe(payload: UnsubscribeIn):
     logger.info(f"ℹ️  Unsubscribing {payload.phone}")
     
-    phone = normalize_phone(payload.phone)
+    phone = _normalize_or_400(payload.phone)
     async with get_session() as session:
         q = select(User).where(User.phone == phone)
         res = await session.execute(q)
@@ -120,7 +132,7 @@ async def run_poll_now():
 @app.get("/status/{phone}")
 async def status(phone: str):
     logger.info(f"ℹ️  Checking subscription status for {phone}")
-    phone = normalize_phone(phone)
+    phone = _normalize_or_400(phone)
     async with get_session() as session:
         q = select(User).where(User.phone == phone)
         res = await session.execute(q)
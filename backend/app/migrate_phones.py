@@ -0,0 +1,118 @@
+"""
+One-shot migration: canonicalize User.phone / OTP.phone to E.164 and merge
+users that collapse onto the same number.
+
+Usage (from backend/):
+    python -m app.migrate_phones --dry-run
+    python -m app.migrate_phones
+"""
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlmodel import select
+from app.db import get_session, init_db
+from app.models import User, OTP, AlertedGame
+from app.utils import normalize_phones
+
+logger = logging.getLogger("migrate_phones")
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # sqlite hands back naive datetimes even for timezone=True columns
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _pick_survivor(users: List[User]) -> User:
+    """
+    Keep the verified user if any, otherwise the oldest one.
+    """
+    return sorted(users, key=lambda u: (not u.verified, _as_utc(u.created_at), u.id))[0]
+
+
+async def migrate_phones(dry_run: bool = False) -> Dict[str, int]:
+    stats = {"users": 0, "updated": 0, "merged": 0, "invalid": 0, "otps_updated": 0}
+
+    async with get_session() as session:
+        users = (await session.exec(select(User))).all()
+        stats["users"] = len(users)
+
+        canonical_phones, stats["invalid"] = normalize_phones([u.phone for u in users])
+        groups: Dict[str, List[User]] = defaultdict(list)
+        for user, canonical in zip(users, canonical_phones):
+            if canonical is None:
+                logger.warning(f"⚠️  Leaving user id={user.id} untouched, invalid phone {user.phone!r}")
+                continue
+            groups[canonical].append(user)
+
+        for canonical, group in groups.items():
+            survivor = _pick_survivor(group)
+            duplicates = [u for u in group if u.id != survivor.id]
+
+            if duplicates:
+                logger.info(f"ℹ️  Merging user ids {[u.id for u in duplicates]} into id={survivor.id} ({canonical})")
+                stats["merged"] += len(duplicates)
+
+                known = {
+                    a.game_id
+                    for a in (await session.exec(select(AlertedGame).where(AlertedGame.user_id == survivor.id))).all()
+                }
+                for dup in duplicates:
+                    survivor.verified = survivor.verified or dup.verified
+                    if dup.last_alert_at and (
+                        not survivor.last_alert_at or _as_utc(dup.last_alert_at) > _as_utc(survivor.last_alert_at)
+                    ):
+                        survivor.last_alert_at = dup.last_alert_at
+
+                    # move alert history so the merged user is not re-alerted
+                    alerted = (await session.exec(select(AlertedGame).where(AlertedGame.user_id == dup.id))).all()
+                    for a in alerted:
+                        if a.game_id in known:
+                            await session.delete(a)
+                        else:
+                            a.user_id = survivor.id
+                            known.add(a.game_id)
+                            session.add(a)
+
+                    await session.delete(dup)
+
+                # release the unique phone values before renaming the survivor
+                await session.flush()
+
+            if survivor.phone != canonical:
+                stats["updated"] += 1
+                survivor.phone = canonical
+            session.add(survivor)
+
+        otps = (await session.exec(select(OTP))).all()
+        canonical_otp_phones, _ = normalize_phones([o.phone for o in otps])
+        for otp, canonical in zip(otps, canonical_otp_phones):
+            if canonical and otp.phone != canonical:
+                otp.phone = canonical
+                session.add(otp)
+                stats["otps_updated"] += 1
+
+        if dry_run:
+            await session.rollback()
+            logger.info("ℹ️  Dry run: changes rolled back.")
+        else:
+            await session.commit()
+
+    logger.info(f"✅ Phone migration finished: {stats}")
+    return stats
+
+
+async def _main(dry_run: bool):
+    await init_db()
+    await migrate_phones(dry_run=dry_run)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Canonicalize stored phone numbers to E.164 and merge duplicate users.")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without committing")
+    args = parser.parse_args()
+    asyncio.run(_main(args.dry_run))
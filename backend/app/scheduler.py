@@ -1,43 +1,119 @@
+import asyncio
 import logging
+import time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from app.config import settings
-from app.games_clients import fetch_gamerpower, fetch_epic_freegames, normalize_gamerpower_item
+from app.games_clients import fetch_gamerpower, fetch_epic_freegames, normalize_gamerpower_item, SourceFetchError
+from app.source_health import SourceHealth
 from app.db import get_session
 from app.models import User, AlertedGame
 from app.messaging import send_whatsapp_message
 from sqlmodel import select
 from datetime import datetime, timezone, timedelta
+from typing import Dict, List
 
 logger = logging.getLogger("scheduler")
 scheduler = AsyncIOScheduler(timezone="UTC")
 
-async def poll_and_alert():
-    logger.info("ℹ️  Poll job started: fetching games...")
-    
-    # fetch from gamerpower (both steam and epic)
-    gp_steam = await fetch_gamerpower(platform="steam")
-    gp_epic = await fetch_epic_freegames()
-    epic_raw = await fetch_epic_freegames()
-    
+DEFAULT_MIN_POLL_INTERVAL_MINUTES = 2
+# max interval defaults to this multiple of POLL_INTERVAL_MINUTES
+DEFAULT_MAX_POLL_INTERVAL_FACTOR = 4
+
+
+async def _fetch_gamerpower_steam() -> List[Dict]:
+    return [normalize_gamerpower_item(item) for item in await fetch_gamerpower(platform="steam")]
+
+
+async def _fetch_epic_official() -> List[Dict]:
+    out = []
+    for item in await fetch_epic_freegames():
+        gid = str(item.get("id") or item.get("title"))
+        out.append({"id": gid, "title": item.get("title"), "url": item.get("url"), "platform": "epic", "ends_at": item.get("end_date")})
+    return out
+
+
+# source name -> coroutine returning normalized games { id, title, url, platform, ends_at }
+SOURCES = {
+    "gamerpower_steam": _fetch_gamerpower_steam,
+    "epic": _fetch_epic_official,
+}
+
+
+def _build_health() -> Dict[str, SourceHealth]:
+    base = timedelta(minutes=settings.POLL_INTERVAL_MINUTES)
+    min_interval = timedelta(minutes=settings.MIN_POLL_INTERVAL_MINUTES or DEFAULT_MIN_POLL_INTERVAL_MINUTES)
+    max_interval = (
+        timedelta(minutes=settings.MAX_POLL_INTERVAL_MINUTES)
+        if settings.MAX_POLL_INTERVAL_MINUTES
+        else base * DEFAULT_MAX_POLL_INTERVAL_FACTOR
+    )
+    return {
+        name: SourceHealth(name=name, base_interval=base, min_interval=min(min_interval, base), max_interval=max(max_interval, base))
+        for name in SOURCES
+    }
+
+
+source_health: Dict[str, SourceHealth] = _build_health()
+
+# last successful result per source; a failing source keeps its previous games
+_latest_games: Dict[str, List[Dict]] = {}
+
+# source jobs run concurrently; alerting must not, or users get the same alert twice
+_alert_lock = asyncio.Lock()
+
+
+async def poll_source(name: str) -> bool:
+    """
+    Fetch one source and update its health. Returns True if the fetch succeeded.
+    """
+    health = source_health[name]
+    started = time.monotonic()
+    try:
+        games = await SOURCES[name]()
+    except SourceFetchError as e:
+        health.record_failure(time.monotonic() - started, str(e))
+        logger.warning(f"❌ Source {name} failed ({health.error_streak} in a row): {e}")
+        return False
+
+    changed = health.record_success(time.monotonic() - started, games)
+    _latest_games[name] = games
+    logger.info(f"ℹ️  Source {name}: {len(games)} games, changed={changed}, latency={health.last_latency:.2f}s")
+    return True
+
+
+def _collect_games() -> Dict[str, Dict]:
     # collect normalized games into dict by id
     games = {}
-    
-    # normalize gamerpower steam
-    for item in gp_steam:
-        g = normalize_gamerpower_item(item)
-        games[g["id"]] = g
-        
-    # normalize gamerpwer epic
-    for item in gp_epic:
-        g = normalize_gamerpower_item(item)
-        games[g["id"]] = g
-        
-    # normalize epic official
-    for item in epic_raw:
-        gid = str(item.get("id") or item.get("title"))
-        games[gid] = {"id": gid, "title": item.get("title"), "url": item.get("url"), "platform": "epic", "ends_at": item.get("end_date")}
-        
+    for name in SOURCES:
+        for g in _latest_games.get(name, []):
+            games[g["id"]] = g
+    return games
+
+
+async def poll_and_alert():
+    """
+    Poll every source once and alert users. Used for the first run and manual polls.
+    """
+    logger.info("ℹ️  Poll job started: fetching games...")
+
+    for name in SOURCES:
+        await poll_source(name)
+
+    await alert_users(_collect_games())
+
+
+async def alert_users(games: Dict[str, Dict]):
+    """
+    Alert verified users about games they have not been alerted about yet.
+    Serialized, so concurrent source jobs cannot both alert before either commits.
+    """
+    async with _alert_lock:
+        await _alert_users(games)
+
+
+async def _alert_users(games: Dict[str, Dict]):
     # now if no games, nothing to do
     if not games:
         logger.info("ℹ️  No free games found in this poll.")
@@ -46,6 +122,9 @@ async def poll_and_alert():
     # load users and decide which to alert
     logger.info("ℹ️  Loading users for alerting...")
     async with get_session() as session:
+        # we commit once per user while iterating the loaded users; expiring them on
+        # commit would trigger lazy loads, which async sessions cannot do
+        session.sync_session.expire_on_commit = False
         result = await session.exec(
             select(User).where(User.verified == True)
         )
@@ -106,24 +185,68 @@ async def poll_and_alert():
                     logger.exception("❌ Failed to rollback session after error.")
             
 
+async def _poll_source_job(name: str):
+    try:
+        # alert on every successful poll, not only on changes, so users who
+        # verified since the last change still get the current games
+        if await poll_source(name):
+            await alert_users(_collect_games())
+    finally:
+        _reschedule_source(name)
+
+
+def _source_trigger(interval: timedelta) -> IntervalTrigger:
+    return IntervalTrigger(
+        seconds=int(interval.total_seconds()),
+        start_date=datetime.now(timezone.utc) + interval,
+        timezone="UTC"
+    )
+
+
+def _reschedule_source(name: str):
+    interval = source_health[name].next_interval()
+    scheduler.reschedule_job(
+        f"poll_{name}",
+        trigger=_source_trigger(interval)
+    )
+    logger.info(f"ℹ️  Next poll of {name} in {interval}")
+
+
+def _schedule_sources():
+    # per-source jobs take over once the initial full poll has run
+    for name, health in source_health.items():
+        interval = health.next_interval()
+        scheduler.add_job(
+            _poll_source_job,
+            trigger=_source_trigger(interval),
+            args=[name],
+            id=f"poll_{name}",
+            replace_existing=True
+        )
+
+
+async def _initial_poll():
+    try:
+        await poll_and_alert()
+    finally:
+        _schedule_sources()
+
+
+def get_source_health() -> List[Dict]:
+    return [h.snapshot() for h in source_health.values()]
+
+
 def start_scheduler():
     logger.info("ℹ️  Starting scheduler.")
     
     scheduler.remove_all_jobs()
     
-    interval = settings.POLL_INTERVAL_MINUTES
     # schedule first run immediately for testing
     first_run = datetime.now(timezone.utc) + timedelta(seconds=5)
-    # set trigger
-    trigger = IntervalTrigger(
-        minutes=interval, 
-        start_date=first_run, 
-        timezone="UTC"
-    )
     
     scheduler.add_job(
-        poll_and_alert,
-        trigger=trigger,
+        _initial_poll,
+        trigger=DateTrigger(run_date=first_run, timezone="UTC"),
         id="poll_and_alert",
         replace_existing=True
     )
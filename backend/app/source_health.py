@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+# poll this close to a known promo rotation at the minimum interval
+ROTATION_LEAD = timedelta(minutes=15)
+# keep polling fast this long after a rotation until the source changes
+ROTATION_GRACE = timedelta(minutes=30)
+# unchanged polls stretch the interval by this fraction of the base, per poll
+UNCHANGED_BACKOFF_STEP = 0.5
+
+
+def parse_end_date(value) -> Optional[datetime]:
+    """
+    Parse giveaway end dates as returned by the sources:
+    - Epic: '2024-01-11T16:00:00.000Z'
+    - GamerPower: '2024-01-15 23:59:00' or 'N/A'
+    Returns an aware UTC datetime or None.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def next_rotation(games: Iterable[Dict], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Earliest future 'ends_at' among games, ie. when the current promo set rotates
+    (Epic switches its weekly free games when the current offers end).
+    """
+    now = now or datetime.now(timezone.utc)
+    ends = [d for d in (parse_end_date(g.get("ends_at")) for g in games) if d and d > now]
+    return min(ends) if ends else None
+
+
+@dataclass
+class SourceHealth:
+    """
+    Rolling health of one giveaway source and the cadence derived from it.
+    """
+    name: str
+    base_interval: timedelta
+    min_interval: timedelta
+    max_interval: timedelta
+
+    last_latency: Optional[float] = None
+    last_success_at: Optional[datetime] = None
+    last_changed_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    error_streak: int = 0
+    unchanged_streak: int = 0
+    polls: int = 0
+    changes: int = 0
+    next_rotation_at: Optional[datetime] = None
+    _fingerprint: Optional[frozenset] = field(default=None, repr=False)
+
+    def record_success(self, latency: float, games: List[Dict], now: Optional[datetime] = None) -> bool:
+        """
+        Record a successful fetch. Returns True if the set of games changed.
+        """
+        now = now or datetime.now(timezone.utc)
+        fingerprint = frozenset(str(g.get("id")) for g in games)
+        changed = fingerprint != self._fingerprint
+
+        self.polls += 1
+        self.last_latency = latency
+        self.last_success_at = now
+        self.last_error = None
+        self.error_streak = 0
+        self._fingerprint = fingerprint
+
+        if changed:
+            self.changes += 1
+            self.unchanged_streak = 0
+            self.last_changed_at = now
+        else:
+            self.unchanged_streak += 1
+
+        if changed or not self.in_rotation_window(now):
+            # inside the window keep a just-passed rotation until the source actually rotates
+            self.next_rotation_at = next_rotation(games, now)
+        return changed
+
+    def record_failure(self, latency: float, error: str) -> None:
+        self.polls += 1
+        self.last_latency = latency
+        self.last_error = error
+        self.error_streak += 1
+
+    def in_rotation_window(self, now: Optional[datetime] = None) -> bool:
+        if not self.next_rotation_at:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return self.next_rotation_at - ROTATION_LEAD <= now <= self.next_rotation_at + ROTATION_GRACE
+
+    def next_interval(self, now: Optional[datetime] = None) -> timedelta:
+        """
+        - around a promo rotation: minimum interval, even while failing
+        - failing: exponential back-off from the base interval
+        - unchanged: linear back-off from the base interval
+        Always capped so we do not sleep past an upcoming rotation window.
+        """
+        now = now or datetime.now(timezone.utc)
+
+        if self.in_rotation_window(now):
+            interval = self.min_interval
+        elif self.error_streak:
+            interval = self.base_interval * (2 ** min(self.error_streak, 10))
+        else:
+            interval = self.base_interval * (1 + UNCHANGED_BACKOFF_STEP * self.unchanged_streak)
+
+        if self.next_rotation_at and now < self.next_rotation_at - ROTATION_LEAD:
+            interval = min(interval, self.next_rotation_at - ROTATION_LEAD - now)
+
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def snapshot(self) -> Dict:
+        iso = lambda d: d.isoformat() if d else None
+        return {
+            "name": self.name,
+            "polls": self.polls,
+            "changes": self.changes,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "last_success_at": iso(self.last_success_at),
+            "last_changed_at": iso(self.last_changed_at),
+            "last_error": self.last_error,
+            "error_streak": self.error_streak,
+            "unchanged_streak": self.unchanged_streak,
+            "next_rotation_at": iso(self.next_rotation_at),
+            "next_interval_seconds": int(self.next_interval().total_seconds()),
+        }
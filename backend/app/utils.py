@@ -1,12 +1,147 @@
 import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+
 logger = logging.getLogger("utils")
 
-def normalize_phone(phone: str) -> str:
+# precompiled once at import; normalize_phone sits on every request path
+_SEPARATORS_RE = re.compile(r"[\s\-.()/]+")
+_DIGITS_RE = re.compile(r"^\d+$")
+_E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
+_WHATSAPP_PREFIX = "whatsapp:"
+
+# national significant number lengths per country; numbers for other countries only get
+# the generic E.164 check. Alerts go out by SMS / WhatsApp, so where mobile and landline
+# lengths differ (IT, JP, CN, AE) only mobile lengths are accepted on purpose.
+NATIONAL_NUMBER_LENGTHS: Dict[str, Tuple[int, ...]] = {
+    "1": (10,),     # NANP (US, CA, ...)
+    "7": (10,),     # RU, KZ
+    "33": (9,),     # FR
+    "34": (9,),     # ES
+    "39": (9, 10),  # IT (mobile)
+    "44": (10,),    # GB
+    "55": (10, 11), # BR
+    "61": (9,),     # AU
+    "65": (8,),     # SG
+    "81": (10,),    # JP (mobile)
+    "86": (11,),    # CN (mobile)
+    "91": (10,),    # IN
+    "92": (10,),    # PK
+    "880": (10,),   # BD
+    "971": (9,),    # AE (mobile)
+}
+
+PHONE_CACHE_SIZE = 65536
+
+
+def is_valid_e164(phone: str) -> bool:
+    """
+    True if phone is already in canonical E.164 form (eg. +919876543210).
+    """
+    return bool(_E164_RE.match(phone))
+
+
+def _resolve_default(default_country_code: Optional[str]) -> Tuple[Optional[str], Optional[Tuple[int, ...]]]:
     """
-    Minimal normalization for E.164 formatting requirement:
-    - User must input a phone number including country code ideally.
-    For now we'll strip spaces and dashes.
-    You can improve using phonenumbers library later.
+    Default country code (digits only) and its allowed national number lengths.
+    DEFAULT_NATIONAL_NUMBER_LENGTH overrides the table for the configured default country.
     """
-    p = phone.strip().replace(" ", "").replace("-", "")
-    return p
+    configured = (settings.DEFAULT_COUNTRY_CODE or "").lstrip("+") or None
+    country_code = (default_country_code.lstrip("+") or None) if default_country_code is not None else configured
+    if not country_code:
+        return None, None
+    if country_code == configured and settings.DEFAULT_NATIONAL_NUMBER_LENGTH:
+        return country_code, (settings.DEFAULT_NATIONAL_NUMBER_LENGTH,)
+    return country_code, NATIONAL_NUMBER_LENGTHS.get(country_code)
+
+
+def _split_country_code(digits: str) -> Optional[str]:
+    # calling codes are prefix-free, so at most one of 1-3 leading digits is a known code
+    for size in (1, 2, 3):
+        if digits[:size] in NATIONAL_NUMBER_LENGTHS:
+            return digits[:size]
+    return None
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize(phone: str, default_country_code: Optional[str], default_lengths: Optional[Tuple[int, ...]]) -> str:
+    p = phone.strip()
+    if p.lower().startswith(_WHATSAPP_PREFIX):
+        p = p[len(_WHATSAPP_PREFIX):]
+    p = _SEPARATORS_RE.sub("", p)
+
+    if p.startswith("+"):
+        digits = p[1:]
+    elif p.startswith("00"):
+        # international dialing prefix, eg. 0091...
+        digits = p[2:]
+    elif p.startswith("0") and default_country_code:
+        # national trunk prefix, eg. 098... -> +9198...
+        digits = default_country_code + p[1:]
+    elif default_country_code and default_lengths:
+        if len(p) in default_lengths:
+            digits = default_country_code + p
+        elif p.startswith(default_country_code) and len(p) - len(default_country_code) in default_lengths:
+            # country code typed without '+', eg. 919876543210
+            digits = p
+        else:
+            raise ValueError(f"Invalid phone number: {phone!r}")
+    elif default_country_code:
+        digits = default_country_code + p
+    else:
+        # without a default country a bare number is ambiguous, never guess its country
+        raise ValueError(f"Invalid phone number (missing country code): {phone!r}")
+
+    if not _DIGITS_RE.match(digits):
+        raise ValueError(f"Invalid phone number: {phone!r}")
+
+    normalized = f"+{digits}"
+    if not is_valid_e164(normalized):
+        raise ValueError(f"Invalid phone number: {phone!r}")
+
+    country_code = default_country_code if default_country_code and digits.startswith(default_country_code) else _split_country_code(digits)
+    lengths = default_lengths if country_code == default_country_code else NATIONAL_NUMBER_LENGTHS.get(country_code)
+    if country_code and lengths and len(digits) - len(country_code) not in lengths:
+        raise ValueError(f"Invalid phone number: {phone!r}")
+
+    return normalized
+
+
+def normalize_phone(phone: str, default_country_code: Optional[str] = None) -> str:
+    """
+    Normalize a user supplied phone number to E.164 (eg. +919876543210).
+    - Strips spaces, dashes, dots, brackets and a 'whatsapp:' prefix.
+    - Accepts '+' and '00' international prefixes.
+    - Numbers without an international prefix get the default country code
+      (settings.DEFAULT_COUNTRY_CODE unless one is passed in); a leading
+      national trunk '0' is dropped. Without a default country such numbers
+      are rejected.
+    - For countries in NATIONAL_NUMBER_LENGTHS (or DEFAULT_NATIONAL_NUMBER_LENGTH
+      for the default country) the national part must have a valid length.
+    Raises ValueError if the result is not a valid E.164 number.
+    Results are memoized in an LRU cache; the function is pure, so it is
+    safe to call from the event loop and from worker threads.
+    """
+    return _normalize(phone, *_resolve_default(default_country_code))
+
+
+def normalize_phones(phones: Iterable[str], default_country_code: Optional[str] = None) -> Tuple[List[Optional[str]], int]:
+    """
+    Batch variant of normalize_phone for bulk imports and the alert pipeline.
+    Returns (results in input order, number of invalid inputs); invalid numbers
+    map to None instead of raising, callers decide how to report them.
+    """
+    default_country_code, default_lengths = _resolve_default(default_country_code)
+
+    out: List[Optional[str]] = []
+    append = out.append
+    invalid = 0
+    for phone in phones:
+        try:
+            append(_normalize(phone, default_country_code, default_lengths))
+        except ValueError:
+            append(None)
+            invalid += 1
+    return out, invalid
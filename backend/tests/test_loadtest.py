@@ -0,0 +1,78 @@
+import argparse
+
+import pytest
+
+from app.loadtest import _summary_ms, build_parser, check_slo, parse_mix, percentile
+
+
+def test_parse_mix_reads_weights():
+    assert parse_mix("subscribe=1,verify=2,status=8") == {"subscribe": 1.0, "verify": 2.0, "status": 8.0}
+    assert parse_mix("status") == {"status": 1.0}
+
+
+@pytest.mark.parametrize("spec", [
+    "login=1",
+    "status=0",
+    "subscribe=0,status=0",
+    "status=-1",
+    "status=abc",
+])
+def test_parse_mix_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_mix(spec)
+
+
+def test_percentile_nearest_rank_on_small_lists():
+    assert percentile([], 50) is None
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([1.0, 2.0], 50) == 1.0
+    assert percentile([1.0, 2.0], 51) == 2.0
+    values = [float(i) for i in range(1, 11)]
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 95) == 10.0
+    assert percentile(values, 99) == 10.0
+
+
+def test_summary_of_no_samples_is_none():
+    assert _summary_ms([]) == {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+
+def _args(*argv) -> argparse.Namespace:
+    return build_parser().parse_args(list(argv))
+
+
+def _report(p99=100.0, rps=500.0, lag=5.0, error_rate=0.0):
+    return {
+        "overall": {"p99_ms": p99},
+        "throughput_rps": rps,
+        "event_loop_lag": {"p99_ms": lag},
+        "error_rate": error_rate,
+    }
+
+
+def test_check_slo_passes_without_thresholds():
+    assert check_slo(_report(p99=10_000, rps=1, lag=1_000, error_rate=1.0), _args()) == []
+
+
+@pytest.mark.parametrize("flag, value, failing, passing", [
+    ("--p99-ms", "50", _report(p99=100.0), _report(p99=50.0)),
+    ("--min-rps", "1000", _report(rps=500.0), _report(rps=1000.0)),
+    ("--max-loop-lag-ms", "1", _report(lag=5.0), _report(lag=1.0)),
+    ("--max-error-rate", "0.01", _report(error_rate=0.05), _report(error_rate=0.01)),
+])
+def test_check_slo_reports_each_violation(flag, value, failing, passing):
+    assert len(check_slo(failing, _args(flag, value))) == 1
+    assert check_slo(passing, _args(flag, value)) == []
+
+
+def test_check_slo_with_zero_requests():
+    report = {
+        "overall": _summary_ms([]),
+        "throughput_rps": None,
+        "event_loop_lag": _summary_ms([]),
+        "error_rate": None,
+    }
+    args = _args("--p99-ms", "50", "--max-loop-lag-ms", "1", "--max-error-rate", "0")
+    assert check_slo(report, args) == []
+    # nothing completed can never satisfy a throughput floor
+    assert check_slo(report, _args("--min-rps", "1")) == ["throughput None rps < 1.0 rps"]
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+
+from app.source_health import SourceHealth, next_rotation, parse_end_date
+
+NOW = datetime(2026, 10, 19, 10, 0, tzinfo=timezone.utc)
+ROTATION = datetime(2026, 10, 22, 15, 0, tzinfo=timezone.utc)
+EPIC_GAMES = [
+    {"id": "a", "ends_at": "2026-10-22T15:00:00.000Z"},
+    {"id": "b", "ends_at": "2026-10-29T15:00:00.000Z"},
+]
+
+
+def _health() -> SourceHealth:
+    return SourceHealth(
+        name="epic",
+        base_interval=timedelta(hours=1),
+        min_interval=timedelta(minutes=2),
+        max_interval=timedelta(hours=4),
+    )
+
+
+def test_parse_end_date_handles_source_formats():
+    assert parse_end_date("2026-10-22T15:00:00.000Z") == ROTATION
+    assert parse_end_date("2026-10-22 15:00:00") == ROTATION
+    assert parse_end_date("N/A") is None
+    assert parse_end_date(None) is None
+
+
+def test_next_rotation_is_earliest_future_end():
+    assert next_rotation(EPIC_GAMES, NOW) == ROTATION
+    assert next_rotation(EPIC_GAMES, ROTATION + timedelta(minutes=1)) == datetime(2026, 10, 29, 15, 0, tzinfo=timezone.utc)
+    assert next_rotation([{"id": "x", "ends_at": "N/A"}], NOW) is None
+
+
+def test_record_success_detects_changes():
+    h = _health()
+    assert h.record_success(0.1, EPIC_GAMES, NOW) is True
+    assert h.record_success(0.1, EPIC_GAMES, NOW) is False
+    assert h.unchanged_streak == 1
+    assert h.record_success(0.1, EPIC_GAMES[1:], NOW) is True
+    assert h.unchanged_streak == 0
+
+
+def test_unchanged_source_backs_off_linearly_up_to_max():
+    h = _health()
+    h.record_success(0.1, [{"id": "a"}], NOW)
+    assert h.next_interval(NOW) == timedelta(hours=1)
+    h.record_success(0.1, [{"id": "a"}], NOW)
+    assert h.next_interval(NOW) == timedelta(hours=1, minutes=30)
+    for _ in range(10):
+        h.record_success(0.1, [{"id": "a"}], NOW)
+    assert h.next_interval(NOW) == timedelta(hours=4)
+
+
+def test_failing_source_backs_off_exponentially():
+    h = _health()
+    h.record_failure(20.0, "timeout")
+    assert h.next_interval(NOW) == timedelta(hours=2)
+    h.record_failure(20.0, "timeout")
+    assert h.next_interval(NOW) == timedelta(hours=4)
+    h.record_success(0.1, [{"id": "a"}], NOW)
+    assert h.error_streak == 0
+    assert h.next_interval(NOW) == timedelta(hours=1)
+
+
+def test_interval_is_capped_before_rotation_window():
+    h = _health()
+    h.record_success(0.1, EPIC_GAMES, NOW)
+    before_window = ROTATION - timedelta(minutes=45)
+    assert h.next_interval(before_window) == timedelta(minutes=30)
+
+
+def test_rotation_window_polls_at_min_interval():
+    h = _health()
+    h.record_success(0.1, EPIC_GAMES, NOW)
+    assert h.next_interval(ROTATION - timedelta(minutes=10)) == timedelta(minutes=2)
+    assert h.next_interval(ROTATION + timedelta(minutes=20)) == timedelta(minutes=2)
+    assert h.next_interval(ROTATION + timedelta(hours=1)) == timedelta(hours=1)
+
+
+def test_rotation_window_keeps_min_interval_while_failing():
+    h = _health()
+    h.record_success(0.1, EPIC_GAMES, NOW)
+    h.record_failure(20.0, "timeout")
+    assert h.next_interval(ROTATION - timedelta(minutes=2)) == timedelta(minutes=2)
+
+
+def test_rotation_is_kept_until_source_rotates():
+    h = _health()
+    h.record_success(0.1, EPIC_GAMES, NOW)
+    after = ROTATION + timedelta(minutes=5)
+    # still serving the old set just after the switch time: keep polling fast
+    h.record_success(0.1, EPIC_GAMES, after)
+    assert h.next_rotation_at == ROTATION
+    assert h.next_interval(after) == timedelta(minutes=2)
+    # once the set rotates, track the next switch
+    h.record_success(0.1, EPIC_GAMES[1:], after + timedelta(minutes=2))
+    assert h.next_rotation_at == datetime(2026, 10, 29, 15, 0, tzinfo=timezone.utc)
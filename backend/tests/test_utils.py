@@ -0,0 +1,70 @@
+import pytest
+
+from app import utils
+from app.utils import normalize_phone, normalize_phones
+
+
+@pytest.fixture(autouse=True)
+def india_default(monkeypatch):
+    monkeypatch.setattr(utils.settings, "DEFAULT_COUNTRY_CODE", "91")
+    monkeypatch.setattr(utils.settings, "DEFAULT_NATIONAL_NUMBER_LENGTH", None)
+
+
+@pytest.mark.parametrize("raw", [
+    "+91 98765-43210",
+    "+91 (98765) 43210",
+    "0091 98765 43210",
+    "098765 43210",
+    "98765.43210",
+    "919876543210",
+    "whatsapp:+919876543210",
+])
+def test_normalize_phone_canonicalizes_variants(raw):
+    assert normalize_phone(raw) == "+919876543210"
+
+
+def test_normalize_phone_keeps_foreign_international_numbers():
+    assert normalize_phone("+1 415 555 2671") == "+14155552671"
+    assert normalize_phone("0014155552671") == "+14155552671"
+
+
+@pytest.mark.parametrize("raw", [
+    "14155552671",      # US number without '+', not an Indian number
+    "91987654321",      # one digit short
+    "+9198765432100",   # one digit too many
+    "+1 415 555 267",   # NANP needs 10 national digits
+    "+0123456789",
+    "abc",
+    "",
+])
+def test_normalize_phone_rejects_invalid(raw):
+    with pytest.raises(ValueError):
+        normalize_phone(raw)
+
+
+def test_normalize_phone_uses_explicit_default_country():
+    assert normalize_phone("(415) 555-2671", default_country_code="+1") == "+14155552671"
+    with pytest.raises(ValueError):
+        normalize_phone("98765 4321", default_country_code="1")
+
+
+def test_national_length_setting_overrides_table(monkeypatch):
+    monkeypatch.setattr(utils.settings, "DEFAULT_NATIONAL_NUMBER_LENGTH", 8)
+    assert normalize_phone("12345678") == "+9112345678"
+    with pytest.raises(ValueError):
+        normalize_phone("9876543210")
+
+
+def test_normalize_phones_returns_results_in_order_and_invalid_count():
+    results, invalid = normalize_phones(["98765 43210", "nope", "+1 415 555 2671", "123"])
+    assert results == ["+919876543210", None, "+14155552671", None]
+    assert invalid == 2
+
+
+@pytest.mark.parametrize("raw", ["9876543210", "098765 43210", "919876543210"])
+def test_normalize_phone_without_default_country_requires_prefix(monkeypatch, raw):
+    monkeypatch.setattr(utils.settings, "DEFAULT_COUNTRY_CODE", None)
+    with pytest.raises(ValueError):
+        normalize_phone(raw)
+    assert normalize_phone("+91 98765 43210") == "+919876543210"
+    assert normalize_phone("0091 98765 43210") == "+919876543210"